@@ -8,8 +8,7 @@ to communicate with and control a WhatsMiner device.
 
 import json
 
-from whatsminer_interface import WhatsminerAPIv3
-from whatsminer_trans import WhatsminerTCP
+from whatsminer_session import WhatsminerSession
 
 
 def main() -> None:
@@ -22,44 +21,24 @@ def main() -> None:
     miner_account = "super"
     miner_passwd = "super"
 
-    # Initialize API and TCP connection
-    whatsminer_api = WhatsminerAPIv3(miner_account, miner_passwd)
-    whatsminer_tcp = WhatsminerTCP(miner_ip, miner_port, miner_account, miner_passwd)
-
     try:
-        # Connect to the miner
-        whatsminer_tcp.connect()
-
-        # Get device info and salt
-        req_info = whatsminer_api.get_request_cmds("get.device.info")
-        req_length = len(req_info)
-        rsp_info = whatsminer_tcp.send(req_info, req_length)
-
-        if rsp_info["code"] == 0:
-            miner_salt = rsp_info["msg"]["salt"]
-            whatsminer_api.set_salt(miner_salt)
-            print(f"Device info: {json.dumps(rsp_info, indent=2)}")
-        else:
-            print(f"Error: {json.dumps(rsp_info, indent=2)}")
-            return
+        # Connect to the miner; the session fetches the salt on entry
+        with WhatsminerSession(
+            miner_ip, miner_port, miner_account, miner_passwd
+        ) as session:
+            print(f"Device info: {json.dumps(session.device_info, indent=2)}")
 
-        # Example: Restart miner service
-        req_info = whatsminer_api.set_miner_service("restart")
-        req_length = len(req_info)
-        rsp_info = whatsminer_tcp.send(req_info, req_length)
-        print(f"Service restart response: {json.dumps(rsp_info, indent=2)}")
+            # Example: Restart miner service
+            rsp_info = session.send_cmd("set.miner.service", "restart")
+            print(f"Service restart response: {json.dumps(rsp_info, indent=2)}")
 
-        # Example: Change user password (commented out for safety)
-        # req_info = whatsminer_api.set_user_passwd("user1", "user1", "abcde1")
-        # req_length = len(req_info)
-        # rsp_info = whatsminer_tcp.send(req_info, req_length)
-        # print(f"Password change response: {json.dumps(rsp_info, indent=2)}")
+            # Example: Change user password (commented out for safety)
+            # req_info = session.api.set_user_passwd("user1", "user1", "abcde1")
+            # rsp_info = session.send(req_info)
+            # print(f"Password change response: {json.dumps(rsp_info, indent=2)}")
 
     except Exception as e:
         print(f"Error: {e}")
-    finally:
-        # Close the connection
-        whatsminer_tcp.close()
 
 
 if __name__ == "__main__":
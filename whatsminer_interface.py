@@ -1,15 +1,113 @@
-import base64
+import functools
 import hashlib
 import json
 import time
-from typing import Any, Dict, Optional, Union
+from base64 import b64encode as _b64e
+from hashlib import sha256 as _sha256
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 from Cryptodome.Cipher import AES
 
+# Shared compact encoder: the C-accelerated encoder is built once and the
+# separators drop the whitespace json.dumps puts on the wire by default.
+_json_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+@functools.lru_cache(maxsize=128)
+def _plain_request(cmd: str, param: Optional[str]) -> str:
+    """Serialize an unauthenticated request; it depends only on its inputs."""
+    return _json_dumps({"cmd": cmd, "param": param})
+
+
+# Key derivation caches are shared by all instances and keyed on the
+# password + salt bytes, so instances hold no cache objects of their own and
+# a new salt simply misses. The key only depends on the concatenation
+# command + password + salt + ts, so the split between arguments cannot alias.
+@functools.lru_cache(maxsize=256)
+def _prefix_hasher(command: str, pw_salt: bytes) -> "hashlib._Hash":
+    """Hash the constant "command + password + salt" prefix once."""
+    prefix_hasher = _sha256(command.encode("utf-8"))
+    prefix_hasher.update(pw_salt)
+    return prefix_hasher
+
+
+@functools.lru_cache(maxsize=512)
+def _derive_key(command: str, pw_salt: bytes, ts: int) -> bytes:
+    """Derive the SHA-256 key shared by token generation and encryption."""
+    hasher = _prefix_hasher(command, pw_salt).copy()
+    hasher.update(str(ts).encode("utf-8"))
+    return hasher.digest()
+
+
+@functools.lru_cache(maxsize=256)
+def _ecb_cipher(command: str, pw_salt: bytes, ts: int) -> Any:
+    """
+    Create the AES-256 ECB cipher for a command and timestamp.
+
+    ECB keeps no state between blocks, so the cipher can be reused. The
+    mode is fixed by the miner firmware; PyCryptodome uses AES-NI for it
+    where available. Moving to an AEAD mode such as GCM would need a
+    matching firmware change.
+    """
+    return AES.new(_derive_key(command, pw_salt, ts), AES.MODE_ECB)  # type: ignore
+
+
+@functools.lru_cache(maxsize=512)
+def _token(command: str, pw_salt: bytes, ts: int) -> str:
+    """Build the authentication token for a command and timestamp."""
+    # The token is the first 8 base64 characters, i.e. the first 6 bytes
+    return _b64e(_derive_key(command, pw_salt, ts)[:6]).decode("utf-8")
+
+
+def _pkcs7_pad(data: bytes) -> bytes:
+    """Pad data to the 16-byte AES block size (PKCS#7)."""
+    pad_len = 16 - (len(data) & 15)
+    return data + bytes((pad_len,)) * pad_len
+
+
+def batch_encrypt_params(params: Sequence[Any], keys: Sequence[bytes]) -> List[str]:
+    """
+    Encrypt many command parameters, each with its own AES-256 key.
+
+    Parameters that share a key are padded back to back and encrypted in a
+    single ECB call, which processes every block independently.
+
+    Args:
+        params: Parameters to encrypt (serialized to JSON before encryption)
+        keys: One AES key per parameter, see WhatsminerAPIv3.derive_key()
+
+    Returns:
+        Base64 encoded encrypted parameters, in input order
+    """
+    if len(params) != len(keys):
+        raise ValueError("params and keys must have the same length")
+
+    groups: Dict[bytes, List[int]] = {}
+    for index, key in enumerate(keys):
+        groups.setdefault(key, []).append(index)
+
+    results = [""] * len(params)
+    for key, indexes in groups.items():
+        padded = [_pkcs7_pad(_json_dumps(params[index]).encode()) for index in indexes]
+        cipher = AES.new(key, AES.MODE_ECB)  # type: ignore
+        encrypted = memoryview(cipher.encrypt(b"".join(padded)))
+        offset = 0
+        for index, block in zip(indexes, padded):
+            results[index] = _b64e(encrypted[offset : offset + len(block)]).decode()
+            offset += len(block)
+    return results
+
 
 class WhatsminerAPIv3:
     """API interface for Whatsminer API version 3"""
 
+    __slots__ = (
+        "_account",
+        "_password",
+        "_salt",
+        "_pw_salt",
+    )
+
     def __init__(self, account: str, password: str):
         """
         Initialize the API interface.
@@ -18,9 +116,25 @@ class WhatsminerAPIv3:
             account: API account (supported: super, user1, user2, user3)
             password: Account password
         """
-        self.account = account
-        self.password = password
-        self.salt = ""
+        self._account = account
+        self._password = password
+        self._salt = ""
+        self._pw_salt = password.encode("utf-8")
+
+    @property
+    def account(self) -> str:
+        """API account; fixed for the lifetime of the instance."""
+        return self._account
+
+    @property
+    def password(self) -> str:
+        """Account password; fixed for the lifetime of the instance."""
+        return self._password
+
+    @property
+    def salt(self) -> str:
+        """Current salt; change it with set_salt() so derived keys follow."""
+        return self._salt
 
     def set_salt(self, salt: str) -> None:
         """
@@ -29,7 +143,21 @@ class WhatsminerAPIv3:
         Args:
             salt: Salt value (should not be empty)
         """
-        self.salt = salt
+        self._salt = salt
+        self._pw_salt = (self.password + salt).encode("utf-8")
+
+    def derive_key(self, command: str, ts: int) -> bytes:
+        """
+        Return the AES-256 key for a command and timestamp.
+
+        Args:
+            command: API command
+            ts: Timestamp
+
+        Returns:
+            32-byte key, as used by batch_encrypt_params()
+        """
+        return _derive_key(command, self._pw_salt, ts)
 
     def _generate_token(self, command: str, ts: int) -> str:
         """
@@ -42,30 +170,24 @@ class WhatsminerAPIv3:
         Returns:
             Authentication token
         """
-        src_buff = f"{command}{self.password}{self.salt}{ts}"
-        aes_key = hashlib.sha256(src_buff.encode("utf-8")).digest()
-        dst_buff = base64.b64encode(aes_key).decode("utf-8")
-        return dst_buff[:8]
+        return _token(command, self._pw_salt, ts)
 
-    def _encrypt_param(self, param: str, command: str, ts: int) -> str:
+    def _encrypt_param(self, param: Any, command: str, ts: int) -> str:
         """
         Encrypt parameters using AES-256 encryption.
 
         Args:
-            param: Parameters to encrypt
+            param: Parameters to encrypt (serialized to JSON before encryption)
             command: API command
             ts: Timestamp
 
         Returns:
             Base64 encoded encrypted parameters
         """
-        src_buff = f"{command}{self.password}{self.salt}{ts}"
-        aes_key = hashlib.sha256(src_buff.encode("utf-8")).digest()
-        pad_len = 16 - (len(param) % 16)
-        padded_param = param + (chr(pad_len) * pad_len)
-        cipher = AES.new(aes_key, AES.MODE_ECB)  # type: ignore
-        encrypted_bytes = cipher.encrypt(padded_param.encode())
-        return base64.b64encode(encrypted_bytes).decode()
+        padded_param = _pkcs7_pad(_json_dumps(param).encode())
+        cipher = _ecb_cipher(command, self._pw_salt, ts)
+        encrypted_bytes = cipher.encrypt(padded_param)
+        return _b64e(encrypted_bytes).decode()
 
     def get_request_cmds(self, cmd: str, param: Optional[Any] = None) -> str:
         """
@@ -78,8 +200,12 @@ class WhatsminerAPIv3:
         Returns:
             JSON formatted command string
         """
+        # Only memoize None and str parameters: equal-hashing values such as
+        # 1, 1.0 and True nested in other types would share one cache entry
+        if param is None or type(param) is str:
+            return _plain_request(cmd, param)
         payload = {"cmd": cmd, "param": param}
-        return json.dumps(payload)
+        return _json_dumps(payload)
 
     def set_request_cmds(self, cmd: str, param: Optional[Any] = None) -> str:
         """
@@ -98,7 +224,7 @@ class WhatsminerAPIv3:
         payload["ts"] = ts
         payload["token"] = token
         payload["account"] = self.account
-        return json.dumps(payload)
+        return _json_dumps(payload)
 
     def set_fan_poweroff_cool(self, param: Any) -> str:
         """Set fan power-off cooling mode."""
@@ -121,12 +247,12 @@ class WhatsminerAPIv3:
             server_port: Log server port (as string, e.g. "9990")
         """
         payload = {"ip": server_ip, "port": server_port, "proto": "udp"}
-        return self.set_request_cmds("set.log.upload", json.dumps(payload))
+        return self.set_request_cmds("set.log.upload", payload)
 
     def set_miner_cointype(self, cointype: str) -> str:
         """Set miner coin type."""
         payload = {"cointype": cointype}
-        return self.set_request_cmds("set.miner.cointype", json.dumps(payload))
+        return self.set_request_cmds("set.miner.cointype", payload)
 
     def set_miner_fastboot(self, param: str) -> str:
         """
@@ -187,11 +313,11 @@ class WhatsminerAPIv3:
                 "ts": ts,
                 "token": token,
                 "account": self.account,
-                "param": self._encrypt_param(json.dumps(param_data), command, ts),
+                "param": self._encrypt_param(param_data, command, ts),
             }
         )
 
-        return json.dumps(payload)
+        return _json_dumps(payload)
 
     def set_miner_power(self, param: Any) -> str:
         """Set miner power settings."""
@@ -201,7 +327,7 @@ class WhatsminerAPIv3:
         """Set miner power percentage."""
         percent_str = str(percent)
         payload = {"percent": percent_str, "mode": mode}
-        return self.set_request_cmds("set.miner.power_percent", json.dumps(payload))
+        return self.set_request_cmds("set.miner.power_percent", payload)
 
     def set_miner_power_limit(self, param: Any) -> str:
         """Set miner power limit."""
@@ -219,7 +345,7 @@ class WhatsminerAPIv3:
     def set_miner_report(self, gap: int) -> str:
         """Set miner reporting interval."""
         payload = {"gap": gap}
-        return self.set_request_cmds("set.miner.report", json.dumps(payload))
+        return self.set_request_cmds("set.miner.report", payload)
 
     def set_miner_restore_setting(self) -> str:
         """Restore miner to default settings."""
@@ -240,7 +366,7 @@ class WhatsminerAPIv3:
     def set_system_hostname(self, hostname: str) -> str:
         """Set system hostname."""
         payload = {"hostname": hostname}
-        return self.set_request_cmds("set.system.hostname", json.dumps(payload))
+        return self.set_request_cmds("set.system.hostname", payload)
 
     def set_system_factory_reset(self) -> str:
         """Reset system to factory defaults."""
@@ -253,7 +379,7 @@ class WhatsminerAPIv3:
     def set_system_timezone(self, timezone: str, zonename: str) -> str:
         """Set system timezone."""
         payload = {"timezone": timezone, "zonename": zonename}
-        return self.set_request_cmds("set.system.timezone", json.dumps(payload))
+        return self.set_request_cmds("set.system.timezone", payload)
 
     def set_user_passwd(self, username: str, old_passwd: str, new_passwd: str) -> str:
         """Change user password."""
@@ -269,8 +395,8 @@ class WhatsminerAPIv3:
                 "ts": ts,
                 "token": token,
                 "account": self.account,
-                "param": self._encrypt_param(json.dumps(param_data), cmd, ts),
+                "param": self._encrypt_param(param_data, cmd, ts),
             }
         )
 
-        return json.dumps(payload)
+        return _json_dumps(payload)
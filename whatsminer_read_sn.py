@@ -5,11 +5,74 @@ WhatsMiner Serial Number Reader
 This script connects to a WhatsMiner device and reads its serial numbers.
 """
 
+import asyncio
+import errno
+import ipaddress
 import json
-from typing import Any, Dict, Optional
+import selectors
+import socket
+import time
+from typing import Any, Dict, Iterable, List, Optional
 
 from whatsminer_interface import WhatsminerAPIv3
-from whatsminer_trans import WhatsminerTCP
+from whatsminer_session import WhatsminerSession
+from whatsminer_trans import (
+    LENGTH_PREFIX,
+    MAX_RESPONSE_LENGTH,
+    RESPONSE_CACHE_TTL,
+    WhatsminerAsyncTCP,
+)
+
+# Default credentials - you may need to change these
+DEFAULT_ACCOUNT = "super"
+DEFAULT_PASSWORD = "super"
+
+# connect_ex() results meaning a non-blocking connect is in progress
+_CONNECT_PENDING = (
+    0,
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK),
+)
+
+
+def _parse_sn(worker_ip: str, response: Any) -> Optional[Dict[str, Any]]:
+    """
+    Extract the serial numbers from a get.device.info response.
+
+    Args:
+        worker_ip: IP address of the WhatsMiner device
+        response: Decoded get.device.info response
+
+    Returns:
+        Dictionary containing the IP and serial numbers or None on error
+    """
+    if not isinstance(response, dict) or response.get("code") != 0:
+        print(f"Error retrieving device info: {response}")
+        return None
+
+    device_info = response.get("msg")
+    if not isinstance(device_info, dict):
+        print(f"Unexpected device info: {response}")
+        return None
+
+    return _sn_result(worker_ip, device_info)
+
+
+def _sn_result(worker_ip: str, device_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the serial number result from a device info message."""
+    # Extract miner information
+    miner_info = device_info.get("miner", {})
+
+    # Create result dictionary
+    return {
+        "ip": worker_ip,
+        "miner_sn": miner_info.get("miner-sn"),
+        "pcb_sn_0": miner_info.get("pcbsn0"),
+        "pcb_sn_1": miner_info.get("pcbsn1"),
+        "pcb_sn_2": miner_info.get("pcbsn2"),
+        "pcb_sn_3": miner_info.get("pcbsn3"),
+    }
 
 
 def whatsminer_read_sn(worker_ip: str, port: int = 4433) -> Optional[Dict[str, Any]]:
@@ -23,53 +86,244 @@ def whatsminer_read_sn(worker_ip: str, port: int = 4433) -> Optional[Dict[str, A
     Returns:
         Dictionary containing the IP and serial numbers or None if an error occurs
     """
-    # Default credentials - you may need to change these
-    account = "super"
-    password = "super"
-
-    # Initialize API and TCP connection
-    whatsminer_api = WhatsminerAPIv3(account, password)
-    whatsminer_tcp = WhatsminerTCP(worker_ip, port, account, password)
-
     try:
-        # Connect to the miner
-        whatsminer_tcp.connect()
+        # Connect to the miner and fetch device info with the salt
+        with WhatsminerSession(
+            worker_ip,
+            port,
+            DEFAULT_ACCOUNT,
+            DEFAULT_PASSWORD,
+            device_info_ttl=RESPONSE_CACHE_TTL,
+        ) as session:
+            return _sn_result(worker_ip, session.device_info)
 
-        # Get device info
-        req_info = whatsminer_api.get_request_cmds("get.device.info")
-        req_length = len(req_info)
-        response = whatsminer_tcp.send(req_info, req_length)
+    except Exception as error:
+        print(f"Error connecting to {worker_ip}: {error}")
+        return None
 
-        if response["code"] != 0:
-            print(f"Error retrieving device info: {response}")
-            return None
 
-        # Get salt and set it
-        salt = response["msg"]["salt"]
-        whatsminer_api.set_salt(salt)
+async def whatsminer_read_sn_async(
+    worker_ip: str, port: int = 4433
+) -> Optional[Dict[str, Any]]:
+    """
+    Asynchronously retrieve the serial numbers of a WhatsMiner device.
 
-        # Extract miner information
-        device_info = response.get("msg", {})
-        miner_info = device_info.get("miner", {})
+    Args:
+        worker_ip: IP address of the WhatsMiner device
+        port: Port number (default: 4433)
 
-        # Create result dictionary
-        result = {
-            "ip": worker_ip,
-            "miner_sn": miner_info.get("miner-sn"),
-            "pcb_sn_0": miner_info.get("pcbsn0"),
-            "pcb_sn_1": miner_info.get("pcbsn1"),
-            "pcb_sn_2": miner_info.get("pcbsn2"),
-            "pcb_sn_3": miner_info.get("pcbsn3"),
-        }
+    Returns:
+        Dictionary containing the IP and serial numbers or None if an error occurs
+    """
+    whatsminer_api = WhatsminerAPIv3(DEFAULT_ACCOUNT, DEFAULT_PASSWORD)
+    whatsminer_tcp = WhatsminerAsyncTCP(
+        worker_ip, port, DEFAULT_ACCOUNT, DEFAULT_PASSWORD
+    )
 
-        return result
+    try:
+        await whatsminer_tcp.connect()
+        req_info = whatsminer_api.get_request_cmds("get.device.info")
+        response = await whatsminer_tcp.send(req_info)
+        return _parse_sn(worker_ip, response)
 
     except Exception as error:
         print(f"Error connecting to {worker_ip}: {error}")
         return None
 
     finally:
-        whatsminer_tcp.close()
+        await whatsminer_tcp.close()
+
+
+async def scan_many(
+    worker_ips: Iterable[str],
+    port: int = 4433,
+    concurrency: int = 64,
+    timeout: Optional[float] = 10.0,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Read the serial numbers of many WhatsMiner devices concurrently.
+
+    Args:
+        worker_ips: IP addresses of the WhatsMiner devices
+        port: Port number (default: 4433)
+        concurrency: Maximum number of devices queried at once
+        timeout: Per-device timeout in seconds, or None to wait indefinitely
+
+    Returns:
+        One result per IP, in input order; None for devices that failed
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def read_one(worker_ip: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                async with asyncio.timeout(timeout):
+                    return await whatsminer_read_sn_async(worker_ip, port)
+            except TimeoutError:
+                print(f"Timed out reading {worker_ip}")
+                return None
+
+    return await asyncio.gather(*(read_one(worker_ip) for worker_ip in worker_ips))
+
+
+class _SnScan:
+    """State of one device transaction driven by scan_subnet()."""
+
+    CONNECTING, SENDING, READ_LEN, READ_BODY = range(4)
+
+    def __init__(self, ip: str, sock: socket.socket, request: bytes, deadline: float):
+        self.ip = ip
+        self.sock = sock
+        self.fd = sock.fileno()
+        self.deadline = deadline
+        self.state = self.CONNECTING
+        self.pending = memoryview(request)
+        self.buffer = bytearray(LENGTH_PREFIX.size)
+        self.received = 0
+
+    def step(self) -> Optional[bytes]:
+        """
+        Advance the transaction after the socket became ready.
+
+        Returns:
+            The response body once complete, otherwise None
+
+        Raises:
+            OSError: If the connection failed or the response is invalid
+        """
+        if self.state == self.CONNECTING:
+            error = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if error:
+                raise OSError(error, "connect failed")
+            self.state = self.SENDING
+
+        if self.state == self.SENDING:
+            sent = self.sock.send(self.pending)
+            self.pending = self.pending[sent:]
+            if not self.pending:
+                self.state = self.READ_LEN
+            return None
+
+        view = memoryview(self.buffer)
+        nbytes = self.sock.recv_into(view[self.received :])
+        if not nbytes:
+            raise OSError("connection closed before the full response was received")
+        self.received += nbytes
+        if self.received < len(self.buffer):
+            return None
+
+        if self.state == self.READ_LEN:
+            rsp_len = LENGTH_PREFIX.unpack(self.buffer)[0]
+            if rsp_len > MAX_RESPONSE_LENGTH:
+                raise OSError(f"invalid response length: {rsp_len}")
+            self.state = self.READ_BODY
+            self.buffer = bytearray(rsp_len)
+            self.received = 0
+            if rsp_len:
+                return None
+
+        return bytes(self.buffer)
+
+
+def scan_subnet(
+    cidr: str,
+    port: int = 4433,
+    max_inflight: int = 256,
+    timeout: float = 10.0,
+) -> List[Dict[str, Any]]:
+    """
+    Read the serial numbers of every WhatsMiner device in a subnet.
+
+    All devices are queried from a single thread through one selector loop
+    over non-blocking sockets, so thousands of hosts need no extra threads.
+
+    Args:
+        cidr: IPv4 or IPv6 network to scan, e.g. "192.168.1.0/24"
+        port: Port number (default: 4433)
+        max_inflight: Maximum number of open connections at once
+        timeout: Per-device timeout in seconds
+
+    Returns:
+        Serial number results of the devices that answered, in address order
+    """
+    body = WhatsminerAPIv3(DEFAULT_ACCOUNT, DEFAULT_PASSWORD).get_request_cmds(
+        "get.device.info"
+    ).encode()
+    request = LENGTH_PREFIX.pack(len(body)) + body
+
+    network = ipaddress.ip_network(cidr, strict=False)
+    family = socket.AF_INET if network.version == 4 else socket.AF_INET6
+    # Walk the hosts lazily: an IPv6 /64 cannot be materialized up front
+    pending_hosts = (str(host) for host in network.hosts())
+    results: Dict[str, Dict[str, Any]] = {}
+    active: Dict[int, _SnScan] = {}
+    exhausted = False
+
+    def finish(scan: _SnScan) -> None:
+        selector.unregister(scan.sock)
+        scan.sock.close()
+        del active[scan.fd]
+
+    with selectors.DefaultSelector() as selector:
+        try:
+            while True:
+                # Keep up to max_inflight connections open
+                while not exhausted and len(active) < max_inflight:
+                    ip = next(pending_hosts, None)
+                    if ip is None:
+                        exhausted = True
+                        break
+                    sock = socket.socket(family, socket.SOCK_STREAM)
+                    try:
+                        sock.setblocking(False)
+                        pending = sock.connect_ex((ip, port)) in _CONNECT_PENDING
+                    except OSError:
+                        sock.close()
+                        raise
+                    if not pending:
+                        sock.close()
+                        continue
+                    scan = _SnScan(ip, sock, request, time.monotonic() + timeout)
+                    active[scan.fd] = scan
+                    selector.register(sock, selectors.EVENT_WRITE, scan)
+
+                if not active:
+                    break
+
+                now = time.monotonic()
+                wait = max(0.0, min(scan.deadline for scan in active.values()) - now)
+                for key, _ in selector.select(wait):
+                    scan = key.data
+                    try:
+                        response = scan.step()
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        finish(scan)
+                        continue
+                    if response is None:
+                        # Switch to read readiness once the request is sent
+                        sent = scan.state >= _SnScan.READ_LEN
+                        if sent and key.events & selectors.EVENT_WRITE:
+                            selector.modify(scan.sock, selectors.EVENT_READ, scan)
+                    else:
+                        finish(scan)
+                        try:
+                            result = _parse_sn(scan.ip, json.loads(response))
+                        except (ValueError, KeyError, AttributeError, TypeError):
+                            result = None
+                        if result is not None:
+                            results[scan.ip] = result
+
+                now = time.monotonic()
+                for scan in [scan for scan in active.values() if scan.deadline <= now]:
+                    finish(scan)
+        finally:
+            # Never leak sockets if the scan is aborted by an exception
+            for scan in active.values():
+                scan.sock.close()
+
+    return [results[ip] for ip in sorted(results, key=ipaddress.ip_address)]
 
 
 def main() -> None:
@@ -0,0 +1,99 @@
+from types import TracebackType
+from typing import Any, Dict, Optional, Type
+
+from whatsminer_interface import WhatsminerAPIv3
+from whatsminer_trans import WhatsminerTCP
+
+
+class WhatsminerSession:
+    """Authenticated session with a Whatsminer device"""
+
+    __slots__ = ("api", "tcp", "device_info", "_device_info_ttl")
+
+    def __init__(
+        self,
+        ip: str,
+        port: int = 4433,
+        account: str = "super",
+        password: str = "super",
+        device_info_ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the session.
+
+        Args:
+            ip: The IP address of the Whatsminer device
+            port: The port number to connect to
+            account: API account (supported: super, user1, user2, user3)
+            password: Account password
+            device_info_ttl: Reuse a get.device.info response up to this many
+                seconds old (see WhatsminerTCP.send_cached); None always
+                fetches a fresh salt
+        """
+        self.api = WhatsminerAPIv3(account, password)
+        self.tcp = WhatsminerTCP(ip, port, account, password)
+        self.device_info: Dict[str, Any] = {}
+        self._device_info_ttl = device_info_ttl
+
+    def __enter__(self) -> "WhatsminerSession":
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # A response may still be in flight; never pool this socket
+            self.tcp.disconnect()
+
+    def open(self) -> None:
+        """
+        Connect to the device and fetch its salt.
+
+        Raises:
+            RuntimeError: If the device info request fails
+        """
+        self.tcp.connect()
+        try:
+            req_info = self.api.get_request_cmds("get.device.info")
+            if self._device_info_ttl is None:
+                response = self.tcp.send(req_info)
+            else:
+                response = self.tcp.send_cached(req_info, self._device_info_ttl)
+            if response["code"] != 0:
+                raise RuntimeError(f"Error retrieving device info: {response}")
+            device_info = response["msg"]
+            self.api.set_salt(device_info["salt"])
+            self.device_info = device_info
+        except BaseException:
+            self.tcp.disconnect()
+            raise
+
+    def close(self) -> None:
+        """Release the connection back to the connection pool."""
+        self.tcp.close()
+
+    def send(self, request: str) -> Dict[str, Any]:
+        """
+        Send a request built by the session's API helper.
+
+        Args:
+            request: JSON request, e.g. from self.api.set_miner_pools(...)
+
+        Returns:
+            The JSON response from the device
+        """
+        return self.tcp.send(request)
+
+    def get_cmd(self, cmd: str, param: Optional[Any] = None) -> Dict[str, Any]:
+        """Send an unauthenticated command and return the response."""
+        return self.tcp.send(self.api.get_request_cmds(cmd, param))
+
+    def send_cmd(self, cmd: str, param: Optional[Any] = None) -> Dict[str, Any]:
+        """Send an authenticated command and return the response."""
+        return self.tcp.send(self.api.set_request_cmds(cmd, param))
@@ -1,12 +1,104 @@
+import asyncio
 import json
 import socket
 import struct
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+# Largest response body the devices are expected to send
+MAX_RESPONSE_LENGTH = 8192
+
+# Little-endian uint32 length prefix framing every message
+LENGTH_PREFIX = struct.Struct("<I")
+
+# Let the kernel wait for complete reads where supported; the read loop
+# still covers platforms or signals that return early
+_RECV_FLAGS = getattr(socket, "MSG_WAITALL", 0)
+
+# Idle connections kept for reuse, keyed by (ip, port, account)
+POOL_TTL = 300.0
+POOL_MAXSIZE = 256
+
+_PoolKey = Tuple[str, int, str]
+_pool: "OrderedDict[_PoolKey, Tuple[socket.socket, float]]" = OrderedDict()
+_pool_lock = threading.Lock()
+
+# Successful responses to idempotent getters, keyed by (ip, port, request)
+RESPONSE_CACHE_TTL = 60.0
+RESPONSE_CACHE_MAXSIZE = 1024
+
+_response_cache: "OrderedDict[Tuple[str, int, bytes], Tuple[str, float]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _shutdown(sock: socket.socket) -> None:
+    """Shut down and close a socket, ignoring errors from a dead peer."""
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    sock.close()
+
+
+def _is_idle(sock: socket.socket) -> bool:
+    """Check that a pooled socket is still open and has no unread data."""
+    try:
+        sock.setblocking(False)
+        try:
+            sock.recv(1, socket.MSG_PEEK)
+        finally:
+            sock.setblocking(True)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    # Either the peer closed the connection or stale data is pending
+    return False
+
+
+def _pool_get(key: _PoolKey) -> Optional[socket.socket]:
+    """Take a live idle connection for key out of the pool."""
+    with _pool_lock:
+        entry = _pool.pop(key, None)
+    if entry is None:
+        return None
+    sock, idle_since = entry
+    if time.monotonic() - idle_since > POOL_TTL or not _is_idle(sock):
+        _shutdown(sock)
+        return None
+    return sock
+
+
+def _pool_put(key: _PoolKey, sock: socket.socket) -> None:
+    """Return an idle connection to the pool, evicting the oldest when full."""
+    evicted = []
+    with _pool_lock:
+        previous = _pool.pop(key, None)
+        if previous is not None:
+            evicted.append(previous[0])
+        _pool[key] = (sock, time.monotonic())
+        while len(_pool) > POOL_MAXSIZE:
+            evicted.append(_pool.popitem(last=False)[1][0])
+    for old_sock in evicted:
+        _shutdown(old_sock)
+
+
+def close_pooled_connections() -> None:
+    """Close every idle pooled connection."""
+    with _pool_lock:
+        entries = list(_pool.values())
+        _pool.clear()
+    for sock, _ in entries:
+        _shutdown(sock)
 
 
 class WhatsminerTCP:
     """TCP client for Whatsminer communication protocol"""
 
+    __slots__ = ("ip", "port", "_account", "_password", "sock", "_reused")
+
     def __init__(self, ip: str, port: int, account: str, password: str):
         """
         Initialize the TCP client for Whatsminer.
@@ -19,44 +111,168 @@ class WhatsminerTCP:
         """
         self.ip = ip
         self.port = port
-        self.account = account
-        self.password = password
+        self._account = account
+        self._password = password
         self.sock: Optional[socket.socket] = None
+        self._reused = False
+
+    @property
+    def account(self) -> str:
+        """Account name; fixed for the lifetime of the client."""
+        return self._account
+
+    @property
+    def password(self) -> str:
+        """Account password; fixed for the lifetime of the client."""
+        return self._password
+
+    @property
+    def _pool_key(self) -> _PoolKey:
+        return (self.ip, self.port, self.account)
 
     def connect(self) -> None:
-        """Connect to the Whatsminer device."""
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect((self.ip, self.port))
+        """
+        Connect to the Whatsminer device.
+
+        Reuses an idle pooled connection to the same device and account when
+        one is available. Calling connect() while connected does nothing.
+        """
+        if self.sock:
+            return
+        self.sock = _pool_get(self._pool_key)
+        self._reused = self.sock is not None
+        if self.sock is None:
+            self._open()
+
+    def _open(self) -> None:
+        """Open a new TCP connection to the Whatsminer device."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.connect((self.ip, self.port))
+        except BaseException:
+            sock.close()
+            self.sock = None
+            raise
+        self.sock = sock
+        self._reused = False
 
     def close(self) -> None:
-        """Close the connection to the Whatsminer device."""
+        """Release the connection, keeping it in the pool for reuse."""
+        if self.sock:
+            _pool_put(self._pool_key, self.sock)
+            self.sock = None
+
+    def disconnect(self) -> None:
+        """Close the connection to the Whatsminer device without pooling it."""
         if self.sock:
-            self.sock.shutdown(socket.SHUT_RDWR)
-            self.sock.close()
+            _shutdown(self.sock)
+            self.sock = None
+        self._reused = False
 
-    def send(self, message: str, message_length: int) -> Dict[str, Any]:
+    def send(self, message: Union[str, bytes]) -> Dict[str, Any]:
         """
         Send a message to the Whatsminer device.
 
+        Args:
+            message: The message to send; the length prefix is computed
+                from its encoded bytes
+
+        Returns:
+            The JSON response from the device
+        """
+        if not self.sock:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        data = message.encode() if isinstance(message, str) else message
+        return json.loads(self._request(data))
+
+    def send_cached(
+        self, message: Union[str, bytes], ttl: float = RESPONSE_CACHE_TTL
+    ) -> Dict[str, Any]:
+        """
+        Send an idempotent request, reusing a recent response from the device.
+
+        Only successful responses (code 0) are cached. Use this for getters
+        such as get.device.info, never for commands that change state.
+
         Args:
             message: The message to send
-            message_length: The length of the message
+            ttl: Maximum age in seconds of a cached response
 
         Returns:
             The JSON response from the device
         """
+        data = message.encode() if isinstance(message, str) else message
+        key = (self.ip, self.port, data)
+        now = time.monotonic()
+
+        with _response_cache_lock:
+            entry = _response_cache.get(key)
+        if entry is not None and now - entry[1] <= ttl:
+            return json.loads(entry[0])
+
         if not self.sock:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        length_bytes = struct.pack("<I", message_length)
-        self.sock.sendall(length_bytes)
-        self.sock.sendall(message.encode())
-        response = self._receive_response()
+        response = self._request(data)
+        result = json.loads(response)
+        if result.get("code") == 0:
+            with _response_cache_lock:
+                _response_cache.pop(key, None)
+                _response_cache[key] = (response, now)
+                while len(_response_cache) > RESPONSE_CACHE_MAXSIZE:
+                    _response_cache.popitem(last=False)
+        return result
+
+    def _request(self, data: bytes) -> str:
+        """
+        Send one encoded request and read its response.
+
+        A request is only resent when a reused pooled socket fails while
+        writing it, i.e. the device had already dropped the connection.
+        Once the request has been written it is never sent again, so
+        commands such as reboot cannot run twice.
+        """
+        # Send the length prefix and body in one write to avoid Nagle stalls
+        payload = LENGTH_PREFIX.pack(len(data)) + data
+        try:
+            self._sendall(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            reused = self._reused
+            self.disconnect()
+            if not reused:
+                raise
+            # The device dropped the pooled connection; retry once
+            self._open()
+            try:
+                self._sendall(payload)
+            except BaseException:
+                self.disconnect()
+                raise
+        except BaseException:
+            # Includes KeyboardInterrupt: a partly written or unanswered
+            # request must never be returned to the pool
+            self.disconnect()
+            raise
+
+        try:
+            response = self._receive_response()
+        except BaseException:
+            self.disconnect()
+            raise
 
         if response is None:
+            self.disconnect()
             raise RuntimeError("Failed to receive response")
 
-        return json.loads(response)
+        self._reused = False
+        return response
+
+    def _sendall(self, payload: bytes) -> None:
+        """Write a framed request to the socket."""
+        assert self.sock is not None
+        self.sock.sendall(payload)
 
     def _receive_response(self) -> Optional[str]:
         """
@@ -68,24 +284,141 @@ class WhatsminerTCP:
         if not self.sock:
             return None
 
-        buffer = b""
-
         # Read the first 4 bytes for response json length
-        length_data = self.sock.recv(4)
-        if len(length_data) < 4:
+        length_data = bytearray(LENGTH_PREFIX.size)
+        if not self._recv_exact(memoryview(length_data)):
             print("Failed to receive the full length information")
             return None
 
-        rsp_len = struct.unpack("<I", length_data)[0]
-        if rsp_len > 8192:
+        rsp_len = LENGTH_PREFIX.unpack(length_data)[0]
+        if rsp_len > MAX_RESPONSE_LENGTH:
             print("Invalid response length:", rsp_len)
             return None
 
-        # Receive the rest of the data
-        while len(buffer) < rsp_len:
-            more_data = self.sock.recv(rsp_len - len(buffer))
-            if not more_data:
-                break
-            buffer += more_data
+        # Receive the rest of the data straight into a preallocated buffer
+        buffer = bytearray(rsp_len)
+        if not self._recv_exact(memoryview(buffer)):
+            print("Connection closed before the full response was received")
+            return None
+
+        return buffer.decode()
+
+    def _recv_exact(self, view: memoryview) -> bool:
+        """
+        Fill a buffer completely from the socket.
+
+        Args:
+            view: Writable view of the buffer to fill
+
+        Returns:
+            True when the buffer was filled, False if the peer closed first
+        """
+        assert self.sock is not None
+        received = 0
+        while received < len(view):
+            nbytes = self.sock.recv_into(view[received:], 0, _RECV_FLAGS)
+            if not nbytes:
+                return False
+            received += nbytes
+        return True
+
+
+class WhatsminerAsyncTCP:
+    """Asyncio TCP client for Whatsminer communication protocol"""
+
+    __slots__ = ("ip", "port", "_account", "_password", "reader", "writer")
+
+    def __init__(self, ip: str, port: int, account: str, password: str):
+        """
+        Initialize the asyncio TCP client for Whatsminer.
+
+        Args:
+            ip: The IP address of the Whatsminer device
+            port: The port number to connect to
+            account: The account name for authentication
+            password: The password for authentication
+        """
+        self.ip = ip
+        self.port = port
+        self._account = account
+        self._password = password
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def account(self) -> str:
+        """Account name; fixed for the lifetime of the client."""
+        return self._account
+
+    @property
+    def password(self) -> str:
+        """Account password; fixed for the lifetime of the client."""
+        return self._password
+
+    async def connect(self) -> None:
+        """Connect to the Whatsminer device."""
+        self.reader, self.writer = await asyncio.open_connection(self.ip, self.port)
+
+    async def close(self) -> None:
+        """Close the connection to the Whatsminer device."""
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.reader = None
+            self.writer = None
+
+    async def send(self, message: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Send a message to the Whatsminer device.
+
+        Args:
+            message: The message to send; the length prefix is computed
+                from its encoded bytes
+
+        Returns:
+            The JSON response from the device
+        """
+        if not self.writer:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        data = message.encode() if isinstance(message, str) else message
+        self.writer.write(LENGTH_PREFIX.pack(len(data)) + data)
+        await self.writer.drain()
+        response = await self._receive_response()
+
+        if response is None:
+            raise RuntimeError("Failed to receive response")
+
+        return json.loads(response)
+
+    async def _receive_response(self) -> Optional[str]:
+        """
+        Receive the response from the TCP connection.
+
+        Returns:
+            The response as a string or None if an error occurred
+        """
+        if not self.reader:
+            return None
+
+        try:
+            length_data = await self.reader.readexactly(LENGTH_PREFIX.size)
+        except asyncio.IncompleteReadError:
+            print("Failed to receive the full length information")
+            return None
+
+        rsp_len = LENGTH_PREFIX.unpack(length_data)[0]
+        if rsp_len > MAX_RESPONSE_LENGTH:
+            print("Invalid response length:", rsp_len)
+            return None
+
+        try:
+            buffer = await self.reader.readexactly(rsp_len)
+        except asyncio.IncompleteReadError:
+            print("Connection closed before the full response was received")
+            return None
 
         return buffer.decode()